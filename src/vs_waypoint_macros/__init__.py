@@ -4,7 +4,7 @@ Generate waypoint macros for Vintage Story using numpad key combinations.
 """
 
 from vs_waypoint_macros.generator import generate_macros
-from vs_waypoint_macros.image import generate_reference_image
+from vs_waypoint_macros.image import generate_reference_image, generate_sprite_atlas
 from vs_waypoint_macros.models import Category, Icon, KeyCode, Waypoint
 
 __version__ = "1.0.0"
@@ -15,4 +15,5 @@ __all__ = [
     "Waypoint",
     "generate_macros",
     "generate_reference_image",
+    "generate_sprite_atlas",
 ]
@@ -7,7 +7,8 @@ import sys
 from pathlib import Path
 
 from vs_waypoint_macros.generator import DEFAULT_START_INDEX, generate_macros
-from vs_waypoint_macros.image import generate_reference_image
+from vs_waypoint_macros.image import generate_reference_image, generate_sprite_atlas
+from vs_waypoint_macros.server import DEFAULT_HOST, DEFAULT_PORT, serve
 from vs_waypoint_macros.waypoints import WAYPOINTS
 
 
@@ -22,7 +23,7 @@ def parse_args(args: list[str] | None = None) -> argparse.Namespace:
         "-o",
         "--output",
         type=Path,
-        default=Path.cwd(),
+        default=None,
         help="Output directory for generated files (default: current directory)",
     )
 
@@ -46,6 +47,31 @@ def parse_args(args: list[str] | None = None) -> argparse.Namespace:
         help="Only generate reference image, skip macro files",
     )
 
+    parser.add_argument(
+        "--atlas",
+        action="store_true",
+        help="Also generate a sprite atlas of key tiles with a JSON index",
+    )
+
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a local HTTP render service instead of writing files",
+    )
+
+    parser.add_argument(
+        "--host",
+        default=None,
+        help=f"Address for --serve to bind to (default: {DEFAULT_HOST})",
+    )
+
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help=f"Port for --serve to listen on (default: {DEFAULT_PORT})",
+    )
+
     parser.add_argument(
         "-q",
         "--quiet",
@@ -62,18 +88,55 @@ def parse_args(args: list[str] | None = None) -> argparse.Namespace:
     return parser.parse_args(args)
 
 
+def _check_conflicts(parsed: argparse.Namespace) -> str | None:
+    """Return an error message if incompatible options were given together."""
+    if parsed.macros_only and parsed.image_only:
+        return "Cannot specify both --macros-only and --image-only"
+
+    if parsed.macros_only and parsed.atlas:
+        return "Cannot specify both --macros-only and --atlas"
+
+    if parsed.serve:
+        ignored = [
+            flag
+            for flag, given in (
+                ("--output", parsed.output is not None),
+                ("--macros-only", parsed.macros_only),
+                ("--image-only", parsed.image_only),
+                ("--atlas", parsed.atlas),
+            )
+            if given
+        ]
+        if ignored:
+            return f"Cannot specify {', '.join(ignored)} with --serve"
+    elif parsed.host is not None or parsed.port is not None:
+        return "--host and --port require --serve"
+
+    return None
+
+
 def main(args: list[str] | None = None) -> int:
     """Main entry point for the CLI."""
     parsed = parse_args(args)
     verbose = not parsed.quiet
 
-    output_dir = Path(parsed.output).resolve()
+    output_dir = Path(parsed.output or Path.cwd()).resolve()
 
-    if parsed.macros_only and parsed.image_only:
-        print("Error: Cannot specify both --macros-only and --image-only", file=sys.stderr)
+    error = _check_conflicts(parsed)
+    if error:
+        print(f"Error: {error}", file=sys.stderr)
         return 1
 
     try:
+        if parsed.serve:
+            serve(
+                parsed.host or DEFAULT_HOST,
+                parsed.port if parsed.port is not None else DEFAULT_PORT,
+                start_index=parsed.start_index,
+                verbose=verbose,
+            )
+            return 0
+
         # Generate macro files
         if not parsed.image_only:
             files = generate_macros(
@@ -91,6 +154,15 @@ def main(args: list[str] | None = None) -> int:
             image_path = output_dir / "macro-reference.png"
             generate_reference_image(WAYPOINTS, image_path, verbose=verbose)
 
+            if parsed.atlas:
+                atlas_path = output_dir / "macro-atlas.png"
+                generate_sprite_atlas(
+                    WAYPOINTS,
+                    atlas_path,
+                    start_index=parsed.start_index,
+                    verbose=verbose,
+                )
+
     except OSError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import json
+import math
 import platform
 from collections import defaultdict
+from functools import cache
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from PIL import Image, ImageDraw, ImageFont
 
+from vs_waypoint_macros.generator import DEFAULT_START_INDEX, generate_macro
 from vs_waypoint_macros.models import KEYCODE_TO_NAME
 
 if TYPE_CHECKING:
@@ -22,6 +26,7 @@ FONT_SIZE = 12
 TITLE_FONT_SIZE = 16
 BRIGHTNESS_THRESHOLD = 128
 GRID_COLUMNS = 5
+ATLAS_SPACING = 2
 
 # Numpad layout (row, col) -> key name
 NUMPAD_LAYOUT: list[list[str | None]] = [
@@ -52,8 +57,12 @@ def _get_system_font() -> tuple[str, ...]:
         )
 
 
+@cache
 def _load_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
-    """Load a font, trying system fonts first then falling back to default."""
+    """Load a font, trying system fonts first then falling back to default.
+
+    Fonts are cached per size so repeated renders in one process reuse them.
+    """
     for font_path in _get_system_font():
         try:
             return ImageFont.truetype(font_path, size)
@@ -111,6 +120,89 @@ def _word_wrap(
     return lines
 
 
+def _key_dimensions(key_name: str) -> tuple[int, int]:
+    """Return the (width, height) of a numpad key, accounting for wide/tall keys."""
+    if key_name == "0":
+        return KEY_SIZE * 2 + KEY_MARGIN, KEY_SIZE
+    if key_name == "+":
+        return KEY_SIZE, KEY_SIZE * 2 + KEY_MARGIN
+    return KEY_SIZE, KEY_SIZE
+
+
+def _pack_tiles(sizes: list[tuple[int, int]]) -> tuple[list[tuple[int, int]], int, int]:
+    """Skyline-pack rectangles into a roughly square area.
+
+    Each rectangle is placed at the lowest point of the skyline it fits on,
+    so short tiles fill the gaps left beside tall ones.
+
+    Args:
+        sizes: (width, height) of each rectangle.
+
+    Returns:
+        A tuple of the (x, y) position for each rectangle, in input order,
+        followed by the total packed width and height.
+    """
+    if not sizes:
+        return [], 0, 0
+
+    padded = [(w + ATLAS_SPACING, h + ATLAS_SPACING) for w, h in sizes]
+    area = sum(w * h for w, h in padded)
+    max_width = max(math.ceil(math.sqrt(area)), *(w for w, _ in padded))
+
+    # Skyline segments as (x, top, width), left to right
+    skyline: list[tuple[int, int, int]] = [(0, 0, max_width)]
+    positions: list[tuple[int, int]] = [(0, 0)] * len(sizes)
+
+    # Largest first so small tiles fill the remaining gaps
+    order = sorted(range(len(sizes)), key=lambda i: (-padded[i][1], -padded[i][0]))
+
+    for i in order:
+        width, height = padded[i]
+        # Candidate (top, x) at each segment start; x=0 always fits as
+        # max_width is at least the widest rectangle
+        candidates = [
+            (
+                max(
+                    seg_top
+                    for other_x, seg_top, seg_width in skyline
+                    if other_x < seg_x + width and other_x + seg_width > seg_x
+                ),
+                seg_x,
+            )
+            for seg_x, _, _ in skyline
+            if seg_x + width <= max_width
+        ]
+        y, x = min(candidates)
+        positions[i] = (x, y)
+
+        # Raise the skyline under the placed rectangle
+        updated: list[tuple[int, int, int]] = []
+        for seg_x, seg_top, seg_width in skyline:
+            seg_end = seg_x + seg_width
+            if seg_end <= x or seg_x >= x + width:
+                updated.append((seg_x, seg_top, seg_width))
+                continue
+            if seg_x < x:
+                updated.append((seg_x, seg_top, x - seg_x))
+            if seg_end > x + width:
+                updated.append((x + width, seg_top, seg_end - x - width))
+        updated.append((x, y + height, width))
+        updated.sort()
+
+        # Merge neighbouring segments at the same height
+        skyline = [updated[0]]
+        for seg_x, seg_top, seg_width in updated[1:]:
+            prev_x, prev_top, prev_width = skyline[-1]
+            if seg_top == prev_top:
+                skyline[-1] = (prev_x, prev_top, prev_width + seg_width)
+            else:
+                skyline.append((seg_x, seg_top, seg_width))
+
+    packed_width = max(x + w for (x, _), (w, _) in zip(positions, sizes, strict=True))
+    packed_height = max(y + h for (_, y), (_, h) in zip(positions, sizes, strict=True))
+    return positions, packed_width, packed_height
+
+
 def _draw_numpad_key(
     draw: ImageDraw.ImageDraw,
     x: int,
@@ -222,16 +314,12 @@ def generate_reference_image(
                 x = base_x + col_idx * (KEY_SIZE + KEY_MARGIN)
                 y = base_y + TITLE_FONT_SIZE + 10 + row_idx * (KEY_SIZE + KEY_MARGIN)
 
-                # Special handling for wide/tall keys
-                width = KEY_SIZE
-                height = KEY_SIZE
-                if key_name == "0":
-                    width = KEY_SIZE * 2 + KEY_MARGIN
-                elif key_name == "+":
-                    height = KEY_SIZE * 2 + KEY_MARGIN
-                elif key_name == "Enter":
+                if key_name == "Enter":
                     continue  # Skip Enter key
 
+                # Special handling for wide/tall keys
+                width, height = _key_dimensions(key_name)
+
                 # Determine key color and waypoint
                 waypoint = wp_by_key.get(key_name)
                 fill_color = waypoint.resolved_color if waypoint else "#404040"
@@ -247,3 +335,94 @@ def generate_reference_image(
         print(f"Generated reference image: {output_path}")
 
     return output_path
+
+
+def generate_sprite_atlas(
+    waypoints: list[Waypoint],
+    output_path: Path,
+    index_path: Path | None = None,
+    start_index: int = DEFAULT_START_INDEX,
+    *,
+    verbose: bool = True,
+) -> tuple[Path, Path]:
+    """Generate a sprite atlas of every waypoint's key tile plus a JSON index.
+
+    Tiles are rendered with the same routine as the reference image, so they
+    match the sheet exactly. The index maps each macro Index to its macro name
+    and tile rectangle, and each macro name to the list of Indexes using it,
+    since nothing requires macro names to be unique.
+
+    Args:
+        waypoints: List of waypoints to include in the atlas.
+        output_path: Path to save the atlas image.
+        index_path: Path to save the JSON index (default: output_path with a .json suffix).
+        start_index: Starting index for macro numbering, matching generate_macros.
+        verbose: Whether to print progress messages.
+
+    Returns:
+        Paths to the generated atlas image and JSON index.
+    """
+    output_path = Path(output_path)
+    index_path = Path(index_path) if index_path else output_path.with_suffix(".json")
+
+    macro_names = [
+        str(generate_macro(start_index + i, wp)["Name"]) for i, wp in enumerate(waypoints)
+    ]
+    by_name: dict[str, list[int]] = defaultdict(list)
+    for i, macro_name in enumerate(macro_names):
+        by_name[macro_name].append(start_index + i)
+
+    key_names = [KEYCODE_TO_NAME.get(wp.key_code, "?") for wp in waypoints]
+    # rounded_rectangle includes its far edge, so each tile is one pixel larger
+    sizes = [(w + 1, h + 1) for w, h in map(_key_dimensions, key_names)]
+    positions, atlas_width, atlas_height = _pack_tiles(sizes)
+
+    # Transparent background so clients can draw tiles over anything
+    img = Image.new("RGBA", (max(atlas_width, 1), max(atlas_height, 1)), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    font = _load_font(FONT_SIZE)
+
+    tiles: dict[str, dict[str, object]] = {}
+
+    for i, waypoint in enumerate(waypoints):
+        index = start_index + i
+        x, y = positions[i]
+        width, height = sizes[i]
+        _draw_numpad_key(
+            draw,
+            x,
+            y,
+            width - 1,
+            height - 1,
+            key_names[i],
+            waypoint.resolved_color,
+            font,
+            waypoint,
+        )
+
+        tiles[str(index)] = {
+            "name": macro_names[i],
+            "x": x,
+            "y": y,
+            "width": width,
+            "height": height,
+        }
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    img.save(output_path)
+
+    atlas_index = {
+        "image": output_path.name,
+        "width": img.width,
+        "height": img.height,
+        "tiles": tiles,
+        "names": by_name,
+    }
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    index_path.write_text(json.dumps(atlas_index, indent=2), encoding="utf-8")
+
+    if verbose:
+        print(f"Generated sprite atlas: {output_path}")
+        print(f"Generated atlas index: {index_path}")
+
+    return output_path, index_path
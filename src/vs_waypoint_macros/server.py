@@ -0,0 +1,385 @@
+"""Local HTTP render service for waypoint macro bundles."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import json
+import re
+import tempfile
+import zipfile
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+from PIL import ImageColor
+
+from vs_waypoint_macros.generator import DEFAULT_START_INDEX, generate_macros
+from vs_waypoint_macros.image import generate_reference_image, generate_sprite_atlas
+from vs_waypoint_macros.models import Category, Icon, KeyCode, Waypoint
+from vs_waypoint_macros.waypoints import WAYPOINTS
+
+# Service defaults
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+MAX_REQUEST_BYTES = 1024 * 1024
+REQUEST_TIMEOUT = 10
+
+# Request limits: one category per numpad key, one waypoint per key within it
+MAX_CATEGORIES = len(KeyCode)
+MAX_WAYPOINTS = MAX_CATEGORIES * len(KeyCode)
+
+# Colors the in-game waypoint command accepts as a single argument
+COLOR_PATTERN = re.compile(r"#[0-9A-Fa-f]{6}|[A-Za-z]+")
+
+# Fixed timestamp for zip entries so identical inputs give identical bundles
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class BundleCache:
+    """Least-recently-used cache of rendered bundles, bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached bundle for key, marking it most recently used."""
+        bundle = self._entries.get(key)
+        if bundle is not None:
+            self._entries.move_to_end(key)
+        return bundle
+
+    def put(self, key: str, bundle: bytes) -> None:
+        """Store a bundle, evicting least recently used entries to stay within max_bytes."""
+        if len(bundle) > self.max_bytes:
+            return  # Would evict everything and still not fit
+
+        if key in self._entries:
+            self.total_bytes -= len(self._entries.pop(key))
+
+        self._entries[key] = bundle
+        self.total_bytes += len(bundle)
+
+        while self.total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= len(evicted)
+
+
+def _parse_key_code(value: object) -> KeyCode:
+    """Parse a key code given by name (e.g. "NUM1") or numeric value."""
+    if isinstance(value, str):
+        try:
+            return KeyCode[value.upper()]
+        except KeyError:
+            raise ValueError(f"Unknown key code: {value}") from None
+    if isinstance(value, int):
+        return KeyCode(value)
+    raise ValueError(f"Invalid key code: {value!r}")
+
+
+def _parse_name(value: object) -> str:
+    """Parse a waypoint or category name, which becomes part of a macro filename."""
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid name: {value!r}")
+    if "/" in value or "\\" in value or "\0" in value:
+        raise ValueError(f"Name must not contain path separators or null bytes: {value!r}")
+    return value
+
+
+def _parse_color(value: object) -> str:
+    """Parse a #RRGGBB or named color that both the game and Pillow accept."""
+    if not isinstance(value, str) or not COLOR_PATTERN.fullmatch(value):
+        raise ValueError(f"Invalid color: {value!r}")
+    ImageColor.getrgb(value)  # Raises ValueError for unknown color names
+    return value
+
+
+def _parse_waypoint(data: dict[str, object]) -> Waypoint:
+    """Build a Waypoint from its JSON representation."""
+    cat_data = data["category"]
+    if not isinstance(cat_data, dict):
+        raise ValueError("Waypoint category must be an object")
+
+    category = Category(
+        _parse_name(cat_data["name"]),
+        _parse_key_code(cat_data["key_code"]),
+        Icon(cat_data["default_icon"]),
+        _parse_color(cat_data["default_color"]),
+    )
+    icon = data.get("icon")
+    color = data.get("color")
+    return Waypoint(
+        category,
+        _parse_name(data["name"]),
+        _parse_key_code(data["key_code"]),
+        _parse_color(color) if color else None,
+        Icon(icon) if icon else None,
+    )
+
+
+def parse_request(
+    data: dict[str, object],
+    default_start_index: int = DEFAULT_START_INDEX,
+) -> tuple[list[Waypoint], int, bool]:
+    """Parse a render request body.
+
+    Args:
+        data: Decoded JSON body. All fields are optional: "waypoints" (defaults
+            to the predefined set), "start_index" and "atlas".
+        default_start_index: Starting index used when the request omits one.
+
+    Returns:
+        The waypoints, starting macro index and whether to include the sprite atlas.
+
+    Raises:
+        ValueError: If the request is malformed or exceeds the request limits.
+    """
+    raw_waypoints = data.get("waypoints")
+    try:
+        if raw_waypoints is None:
+            waypoints = WAYPOINTS
+        elif isinstance(raw_waypoints, list):
+            if len(raw_waypoints) > MAX_WAYPOINTS:
+                raise ValueError(f"Too many waypoints (maximum {MAX_WAYPOINTS})")
+            waypoints = [_parse_waypoint(wp) for wp in raw_waypoints]
+        else:
+            raise ValueError("waypoints must be a list")
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid waypoint: {e}") from None
+
+    # The reference image grows with the number of categories
+    if len({wp.category.name for wp in waypoints}) > MAX_CATEGORIES:
+        raise ValueError(f"Too many categories (maximum {MAX_CATEGORIES})")
+
+    start_index = data.get("start_index", default_start_index)
+    if not isinstance(start_index, int) or isinstance(start_index, bool):
+        raise ValueError("start_index must be an integer")
+
+    atlas = data.get("atlas", False)
+    if not isinstance(atlas, bool):
+        raise ValueError("atlas must be a boolean")
+
+    return waypoints, start_index, atlas
+
+
+def request_key(waypoints: list[Waypoint], start_index: int, atlas: bool) -> str:
+    """Return a canonical hash of the render inputs.
+
+    Waypoints are hashed by their resolved values, so requests that spell out
+    category defaults share a cache entry with requests that omit them.
+    """
+    canonical = {
+        "waypoints": [
+            [
+                wp.category.name,
+                wp.category.key_code.value,
+                wp.name,
+                wp.key_code.value,
+                wp.resolved_color,
+                wp.resolved_icon.value,
+            ]
+            for wp in waypoints
+        ],
+        "start_index": start_index,
+        "atlas": atlas,
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def render_bundle(
+    waypoints: list[Waypoint],
+    start_index: int = DEFAULT_START_INDEX,
+    *,
+    atlas: bool = False,
+) -> bytes:
+    """Render macro files and the reference image into a zip archive.
+
+    The archive is deterministic, so identical inputs produce identical bytes.
+
+    Args:
+        waypoints: List of waypoints to generate macros for.
+        start_index: Starting index for macro numbering.
+        atlas: Whether to include the sprite atlas and its JSON index.
+
+    Returns:
+        The zip archive contents.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        files = generate_macros(waypoints, output_dir, start_index=start_index, verbose=False)
+        files.append(
+            generate_reference_image(waypoints, output_dir / "macro-reference.png", verbose=False)
+        )
+        if atlas:
+            files.extend(
+                generate_sprite_atlas(
+                    waypoints,
+                    output_dir / "macro-atlas.png",
+                    start_index=start_index,
+                    verbose=False,
+                )
+            )
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for path in files:
+                info = zipfile.ZipInfo(path.name, date_time=ZIP_DATE_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(info, path.read_bytes())
+
+    return buffer.getvalue()
+
+
+class RenderServer(HTTPServer):
+    """HTTP server holding the bundle cache between requests."""
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+        start_index: int = DEFAULT_START_INDEX,
+        *,
+        verbose: bool = True,
+    ) -> None:
+        super().__init__(address, RenderRequestHandler)
+        self.cache = BundleCache(cache_bytes)
+        self.start_index = start_index
+        self.verbose = verbose
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """Handle POST /render requests, returning a zip bundle."""
+
+    server: RenderServer
+    # Drop stalled clients so they cannot block the single-threaded server
+    timeout = REQUEST_TIMEOUT
+
+    def do_POST(self) -> None:
+        """Render (or fetch from cache) the bundle for the request body."""
+        if self.path != "/render":
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+            return
+
+        try:
+            length = self._content_length()
+            if length > MAX_REQUEST_BYTES:
+                self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+                return
+
+            body = self._read_json(length)
+            waypoints, start_index, atlas = parse_request(body, self.server.start_index)
+        except ValueError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        key = request_key(waypoints, start_index, atlas)
+        etag = f'"{key}"'
+
+        # Bundles are deterministic, so a matching ETag needs no rendering
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        bundle = self.server.cache.get(key)
+        cache_status = "hit"
+        if bundle is None:
+            cache_status = "miss"
+            try:
+                bundle = render_bundle(waypoints, start_index, atlas=atlas)
+            except ValueError as e:
+                self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+                return
+            except OSError as e:
+                # Details may include temporary paths, so only log them locally
+                self.log_error("Render failed: %s", e)
+                self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "Failed to render bundle")
+                return
+            self.server.cache.put(key, bundle)
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(len(bundle)))
+        self.send_header("ETag", etag)
+        self.send_header("X-Cache", cache_status)
+        self.end_headers()
+        self.wfile.write(bundle)
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Log requests only when the server is verbose."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _content_length(self) -> int:
+        """Return the request body length from the Content-Length header.
+
+        Raises:
+            ValueError: If the header is missing, not a number or negative.
+        """
+        header = self.headers.get("Content-Length")
+        if header is None:
+            raise ValueError("Content-Length header is required")
+        try:
+            length = int(header)
+        except ValueError:
+            raise ValueError(f"Invalid Content-Length: {header}") from None
+        if length < 0:
+            raise ValueError(f"Invalid Content-Length: {header}")
+        return length
+
+    def _read_json(self, length: int) -> dict[str, object]:
+        """Read and decode a JSON object request body of the given length.
+
+        Raises:
+            ValueError: If the body is not a JSON object.
+        """
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except RecursionError:
+            raise ValueError("Request body is nested too deeply") from None
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        """Send a JSON error response."""
+        payload = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    cache_bytes: int = DEFAULT_CACHE_BYTES,
+    start_index: int = DEFAULT_START_INDEX,
+    *,
+    verbose: bool = True,
+) -> None:
+    """Run the render service until interrupted.
+
+    Args:
+        host: Address to bind to. Defaults to loopback so only local clients can connect.
+        port: Port to listen on.
+        cache_bytes: Maximum total size of cached bundles.
+        start_index: Starting index for requests that do not specify one.
+        verbose: Whether to print progress messages.
+    """
+    with RenderServer((host, port), cache_bytes, start_index, verbose=verbose) as server:
+        if verbose:
+            print(f"Serving on http://{host}:{server.server_port}/render")
+        with contextlib.suppress(KeyboardInterrupt):
+            server.serve_forever()
@@ -0,0 +1,79 @@
+"""Tests for sprite atlas generation."""
+
+from __future__ import annotations
+
+import json
+import random
+from typing import TYPE_CHECKING
+
+from vs_waypoint_macros.image import (
+    ATLAS_SPACING,
+    _key_dimensions,
+    _pack_tiles,
+    generate_sprite_atlas,
+)
+from vs_waypoint_macros.waypoints import WAYPOINTS
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _assert_packed(sizes: list[tuple[int, int]]) -> None:
+    """Check every rectangle lies inside the packed area and none overlap."""
+    positions, width, height = _pack_tiles(sizes)
+    rects = [(x, y, x + w, y + h) for (x, y), (w, h) in zip(positions, sizes, strict=True)]
+
+    for left, top, right, bottom in rects:
+        assert left >= 0
+        assert top >= 0
+        assert right <= width
+        assert bottom <= height
+
+    for i, a in enumerate(rects):
+        for b in rects[i + 1 :]:
+            assert (
+                a[2] + ATLAS_SPACING <= b[0]
+                or b[2] + ATLAS_SPACING <= a[0]
+                or a[3] + ATLAS_SPACING <= b[1]
+                or b[3] + ATLAS_SPACING <= a[1]
+            ), f"{a} overlaps {b}"
+
+
+def test_pack_tiles_empty() -> None:
+    assert _pack_tiles([]) == ([], 0, 0)
+
+
+def test_pack_tiles_numpad_keys() -> None:
+    sizes = [_key_dimensions(name) for name in ("0", "+", "1", "2", "/", "*", "-", ".")]
+    _assert_packed(sizes)
+
+
+def test_pack_tiles_random_layouts() -> None:
+    rng = random.Random(0)
+    for _ in range(100):
+        sizes = [(rng.randint(1, 200), rng.randint(1, 200)) for _ in range(rng.randint(1, 40))]
+        _assert_packed(sizes)
+
+
+def test_sprite_atlas_index(tmp_path: Path) -> None:
+    image_path, index_path = generate_sprite_atlas(
+        WAYPOINTS, tmp_path / "atlas.png", start_index=10, verbose=False
+    )
+
+    assert image_path.exists()
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    assert index["image"] == "atlas.png"
+    assert len(index["tiles"]) == len(WAYPOINTS)
+    assert index["tiles"]["10"]["name"] == "Waypoint POI POI"
+    assert index["names"]["Waypoint POI POI"] == [10]
+
+
+def test_sprite_atlas_duplicate_names(tmp_path: Path) -> None:
+    waypoint = WAYPOINTS[1]
+    _, index_path = generate_sprite_atlas(
+        [waypoint, waypoint], tmp_path / "atlas.png", start_index=1, verbose=False
+    )
+
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    assert set(index["tiles"]) == {"1", "2"}
+    assert index["names"]["Waypoint POI Home"] == [1, 2]
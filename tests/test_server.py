@@ -0,0 +1,146 @@
+"""Tests for the render service."""
+
+from __future__ import annotations
+
+import io
+import zipfile
+
+import pytest
+
+from vs_waypoint_macros.models import KeyCode
+from vs_waypoint_macros.server import (
+    MAX_CATEGORIES,
+    MAX_WAYPOINTS,
+    BundleCache,
+    parse_request,
+    render_bundle,
+    request_key,
+)
+from vs_waypoint_macros.waypoints import WAYPOINTS
+
+
+def _waypoint(**overrides: object) -> dict[str, object]:
+    """Return a valid waypoint request entry with optional overrides."""
+    data: dict[str, object] = {
+        "category": {
+            "name": "POI",
+            "key_code": "NUM0",
+            "default_icon": "star1",
+            "default_color": "#FFD700",
+        },
+        "name": "Home",
+        "key_code": "NUM1",
+    }
+    data.update(overrides)
+    return data
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = BundleCache(10)
+    cache.put("a", b"12345")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"12345"
+
+    cache.put("c", b"123")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"12345"
+    assert cache.get("c") == b"123"
+    assert cache.total_bytes == 8
+
+
+def test_cache_replaces_existing_key() -> None:
+    cache = BundleCache(10)
+    cache.put("a", b"12345")
+    cache.put("a", b"12")
+
+    assert len(cache) == 1
+    assert cache.total_bytes == 2
+
+
+def test_cache_skips_oversized_bundle() -> None:
+    cache = BundleCache(10)
+    cache.put("a", b"123")
+    cache.put("b", b"x" * 11)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"123"
+    assert cache.total_bytes == 3
+
+
+def test_parse_request_defaults() -> None:
+    waypoints, start_index, atlas = parse_request({}, default_start_index=7)
+
+    assert waypoints is WAYPOINTS
+    assert start_index == 7
+    assert atlas is False
+
+
+def test_parse_request_waypoint() -> None:
+    waypoints, _, _ = parse_request({"waypoints": [_waypoint(color="red", icon="home")]})
+
+    assert len(waypoints) == 1
+    assert waypoints[0].key_code is KeyCode.NUM1
+    assert waypoints[0].resolved_color == "red"
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"waypoints": "all"},
+        {"waypoints": [{"name": "Home"}]},
+        {"waypoints": [_waypoint(key_code="BAD")]},
+        {"waypoints": [_waypoint(icon="nope")]},
+        {"waypoints": [_waypoint(color="notacolor")]},
+        {"waypoints": [_waypoint(color="hsl(120, 100%, 50%)")]},
+        {"waypoints": [_waypoint(color="#FFF")]},
+        {"waypoints": [_waypoint(name="a/b")]},
+        {"waypoints": [_waypoint(name="a\\b")]},
+        {"waypoints": [_waypoint(name=["Home"])]},
+        {"start_index": "100"},
+        {"start_index": True},
+        {"atlas": "false"},
+    ],
+)
+def test_parse_request_rejects(body: dict[str, object]) -> None:
+    with pytest.raises(ValueError):
+        parse_request(body)
+
+
+def test_parse_request_limits() -> None:
+    too_many_waypoints = [_waypoint()] * (MAX_WAYPOINTS + 1)
+    with pytest.raises(ValueError, match="Too many waypoints"):
+        parse_request({"waypoints": too_many_waypoints})
+
+    categories = [
+        _waypoint(
+            category={
+                "name": f"Category {i}",
+                "key_code": "NUM0",
+                "default_icon": "star1",
+                "default_color": "#FFD700",
+            }
+        )
+        for i in range(MAX_CATEGORIES + 1)
+    ]
+    with pytest.raises(ValueError, match="Too many categories"):
+        parse_request({"waypoints": categories})
+
+
+def test_request_key_uses_resolved_values() -> None:
+    implicit, _, _ = parse_request({"waypoints": [_waypoint()]})
+    explicit, _, _ = parse_request({"waypoints": [_waypoint(color="#FFD700", icon="star1")]})
+
+    assert request_key(implicit, 100, False) == request_key(explicit, 100, False)
+    assert request_key(implicit, 100, False) != request_key(implicit, 100, True)
+
+
+def test_render_bundle_is_deterministic() -> None:
+    waypoints, _, _ = parse_request({"waypoints": [_waypoint(), _waypoint()]})
+
+    bundle = render_bundle(waypoints, 5, atlas=True)
+
+    assert bundle == render_bundle(waypoints, 5, atlas=True)
+    names = zipfile.ZipFile(io.BytesIO(bundle)).namelist()
+    assert "macro-reference.png" in names
+    assert "macro-atlas.json" in names